@@ -43,20 +43,246 @@ import {
   isEqual,
   diff,
 } from './utils';
+import type { ReadStream } from 'fs';
 
 // Export only the main class for internal use (VSCode extension)
 export { NDFObject, NDFValue, NDFArray } from './types';
 export { ValidationError as ValidationErrorClass } from './errors';
 
+const WHITESPACE_PATTERN = /\s/;
+const WHITESPACE_SPLIT_PATTERN = /\s+/;
+const NUMBER_PATTERN = /^-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?$/;
+const TYPE_HINT_PATTERN = /^@\w+(?:\[\d+\])?\s+(.+)$/;
+// Arrays holding only numbers (and nested number arrays) can go straight to JSON.parse
+const NUMERIC_ARRAY_PATTERN = /^\[[\d\s,.+\-eE[\]]*\]$/;
+
+// Booleans and nulls are matched case-insensitively; nothing longer can be one
+const KEYWORD_VALUES = new Map<string, boolean | null>([
+  ['yes', true],
+  ['true', true],
+  ['no', false],
+  ['false', false],
+  ['null', null],
+  ['none', null],
+  ['-', null],
+]);
+const MAX_KEYWORD_LENGTH = 5;
+
+// Scalars repeat a lot (flags, small numbers, enum-like strings). Results are
+// immutable primitives, so short ones are cached; the oldest entry is evicted first.
+const SCALAR_CACHE = new Map<string, NDFPrimitive>();
+const SCALAR_CACHE_SIZE = 4096;
+const MAX_CACHED_SCALAR_LENGTH = 64;
+
+// Read files in large chunks so the stream keeps reading ahead while a chunk is parsed
+const FILE_READ_CHUNK_SIZE = 1 << 20;
+// Default cap on files loadFiles() keeps open at once
+const MAX_CONCURRENT_FILE_LOADS = 8;
+
+// Indent strings per indent unit, indexed by nesting level
+const INDENT_CACHE = new Map<string, string[]>();
+
+function indentOf(unit: string, level: number): string {
+  let table = INDENT_CACHE.get(unit);
+  if (!table) {
+    table = [''];
+    INDENT_CACHE.set(unit, table);
+  }
+  while (table.length <= level) {
+    table.push(table[table.length - 1] + unit);
+  }
+  return table[level];
+}
+
+function hasOwnKeys(obj: NDFObject): boolean {
+  for (const key in obj) {
+    if (Object.prototype.hasOwnProperty.call(obj, key)) {
+      return true;
+    }
+  }
+  return false;
+}
+
+/** True when no value, including list items, is a nested object */
+function isLeafObject(obj: NDFObject): boolean {
+  for (const key in obj) {
+    const value = obj[key];
+    if (typeof value !== 'object' || value === null) {
+      continue;
+    }
+    if (!Array.isArray(value)) {
+      return false;
+    }
+    for (const item of value) {
+      if (typeof item === 'object' && item !== null && !Array.isArray(item)) {
+        return false;
+      }
+    }
+  }
+  return true;
+}
+
+function parseSimpleValue(value: string): NDFPrimitive {
+  if (value.length > MAX_CACHED_SCALAR_LENGTH) {
+    return classifySimpleValue(value);
+  }
+
+  const cached = SCALAR_CACHE.get(value);
+  if (cached !== undefined) {
+    return cached;
+  }
+
+  const parsed = classifySimpleValue(value);
+  if (SCALAR_CACHE.size >= SCALAR_CACHE_SIZE) {
+    SCALAR_CACHE.delete(SCALAR_CACHE.keys().next().value as string);
+  }
+  SCALAR_CACHE.set(value, parsed);
+  return parsed;
+}
+
+function classifySimpleValue(value: string): NDFPrimitive {
+  value = value.trim();
+  const first = value[0];
+  if ((first === '"' || first === "'") && value[value.length - 1] === first) {
+    const inner = value.slice(1, -1);
+    return processEscapes(inner);
+  }
+  if (value.length <= MAX_KEYWORD_LENGTH) {
+    const keyword = KEYWORD_VALUES.get(value.toLowerCase());
+    if (keyword !== undefined) return keyword;
+  }
+  if ((first === '-' || (first >= '0' && first <= '9')) && NUMBER_PATTERN.test(value)) {
+    return Number(value);
+  }
+  if (first === '@') {
+    const match = value.match(TYPE_HINT_PATTERN);
+    if (match) {
+      return parseSimpleValue(match[1]);
+    }
+    return value;
+  }
+  return value;
+}
+
+/**
+ * Split on commas outside quotes and not nested inside `[]` or `{}`; parts are trimmed.
+ * A quote only opens a string at the start of a part or value, so the apostrophe in
+ * `don't` or the inch mark in `5"` is an ordinary character.
+ */
+function splitTopLevel(text: string): string[] {
+  const parts: string[] = [];
+  let bracketDepth = 0;
+  let braceDepth = 0;
+  let inString = false;
+  let stringChar = '';
+  // True while the last non-space character is `[`, `{`, `,`, `:` or the start of text
+  let atValueStart = true;
+  let start = 0;
+
+  for (let i = 0; i < text.length; i++) {
+    const char = text[i];
+    if (inString) {
+      if (char === stringChar && text[i - 1] !== '\\') inString = false;
+      continue;
+    }
+    if (char === ' ' || char === '\t') {
+      continue;
+    }
+
+    if ((char === '"' || char === "'") && atValueStart) {
+      inString = true;
+      stringChar = char;
+    } else if (char === '[') bracketDepth++;
+    else if (char === ']') bracketDepth--;
+    else if (char === '{') braceDepth++;
+    else if (char === '}') braceDepth--;
+    else if (char === ',' && bracketDepth === 0 && braceDepth === 0) {
+      parts.push(text.slice(start, i).trim());
+      start = i + 1;
+    }
+    atValueStart = char === '[' || char === '{' || char === ',' || char === ':';
+  }
+
+  const last = text.slice(start).trim();
+  if (last) parts.push(last);
+
+  return parts;
+}
+
+function getIndent(line: string): number {
+  let indent = 0;
+  while (indent < line.length) {
+    const code = line.charCodeAt(indent);
+    // Any whitespace counts as indent (NBSP, the `\r` of a CRLF blank line, ...);
+    // only characters outside printable ASCII need the full test
+    if (code !== 32 && code !== 9 &&
+        ((code > 32 && code < 127) || !WHITESPACE_PATTERN.test(line[indent]))) {
+      break;
+    }
+    indent++;
+  }
+  return indent;
+}
+
+function removeInlineComment(line: string): string {
+  const hashIndex = line.indexOf('#');
+  if (hashIndex === -1) {
+    return line;
+  }
+
+  // Only a quote before the first `#` can hide it inside a string
+  if (line.lastIndexOf('"', hashIndex) === -1 && line.lastIndexOf("'", hashIndex) === -1) {
+    return line.slice(0, hashIndex);
+  }
+
+  let inString = false;
+  let stringChar = '';
+  
+  for (let i = 0; i < line.length; i++) {
+    const char = line[i];
+    const prevChar = i > 0 ? line[i - 1] : '';
+    
+    if (!inString && (char === '"' || char === "'")) {
+      inString = true;
+      stringChar = char;
+    } else if (inString && char === stringChar && prevChar !== '\\') {
+      inString = false;
+    } else if (!inString && char === '#') {
+      return line.slice(0, i);
+    }
+  }
+  
+  return line;
+}
+
+// One object or block list being written by dumps(). `index` is the next entry or
+// item to write; `start` is the output length when the object's header was written.
+type DumpFrame =
+  | { kind: 'object'; entries: Array<[string, NDFValue]>; index: number; level: number; start: number }
+  | { kind: 'list'; items: NDFArray; index: number; level: number };
+
 interface ParseContext {
-  lines: string[];
-  lineIndex: number;
+  lineNumber: number;
+  partialLine: string;
+  root: NDFObject;
+  stack: ParseFrame[];
+  // Shared by every `key: |` block; only one can be open at a time
+  textLines: string[];
   options: Required<ParseOptions>;
   references: ReferenceStore;
   errors: Array<{ message: string; line: number; column: number; code: string }>;
   warnings: Array<{ message: string; line: number; column: number; code: string }>;
 }
 
+// One open container during parsing. A `pending` frame is a `key:` (or bare `-`)
+// whose children have not been seen yet; it becomes a block or list on the next line.
+// A `text` frame collects the lines of a `key: |` block.
+type ParseFrame =
+  | { kind: 'block'; indent: number; value: NDFObject; parent: NDFObject | NDFArray | null; key?: string }
+  | { kind: 'list'; indent: number; value: NDFArray; parent: NDFObject | NDFArray | null; key?: string }
+  | { kind: 'pending'; indent: number; parent: NDFObject | NDFArray | null; key?: string }
+  | { kind: 'text'; indent: number; textLength: number; parent: NDFObject | NDFArray | null; key?: string };
+
 export class NoteDataFormat {
   private defaultParseOptions: Required<ParseOptions>;
   private defaultDumpOptions: Required<DumpOptions>;
@@ -75,9 +301,65 @@ export class NoteDataFormat {
     if (typeof (globalThis as any).window !== 'undefined') {
       throw new Error('loadFile() is only available in Node.js environment');
     }
-    const fs = await import('fs/promises');
-    const content = await fs.readFile(filepath, 'utf-8');
-    return this.parse(content, options);
+    const fs = await import('fs');
+    return this.parseStream(fs.createReadStream(filepath, {
+      encoding: 'utf-8',
+      highWaterMark: FILE_READ_CHUNK_SIZE,
+    }), options);
+  }
+
+  /**
+   * Load several files, keeping at most `concurrency` of them open at once
+   * (the default is used when it is not a finite number of at least 1).
+   * Results are returned in input order; on the first failure the remaining
+   * reads are cancelled and the error is rethrown.
+   */
+  async loadFiles(
+    filepaths: string[],
+    options?: Partial<ParseOptions>,
+    concurrency: number = MAX_CONCURRENT_FILE_LOADS
+  ): Promise<NDFObject[]> {
+    if (typeof (globalThis as any).window !== 'undefined') {
+      throw new Error('loadFiles() is only available in Node.js environment');
+    }
+    const fs = await import('fs');
+    const results: NDFObject[] = new Array(filepaths.length);
+    const open = new Set<ReadStream>();
+    let next = 0;
+    let failed = false;
+
+    const worker = async (): Promise<void> => {
+      while (!failed && next < filepaths.length) {
+        const index = next++;
+        const stream = fs.createReadStream(filepaths[index], {
+          encoding: 'utf-8',
+          highWaterMark: FILE_READ_CHUNK_SIZE,
+        });
+        open.add(stream);
+        try {
+          results[index] = await this.parseStream(stream, options);
+        } catch (error) {
+          if (!failed) {
+            failed = true;
+            for (const other of open) {
+              if (other !== stream) {
+                other.destroy();
+              }
+            }
+          }
+          throw error;
+        } finally {
+          open.delete(stream);
+        }
+      }
+    };
+
+    const limit = Number.isFinite(concurrency) && concurrency >= 1
+      ? Math.floor(concurrency)
+      : MAX_CONCURRENT_FILE_LOADS;
+    const workerCount = Math.max(1, Math.min(limit, filepaths.length));
+    await Promise.all(Array.from({ length: workerCount }, worker));
+    return results;
   }
 
   async saveFile(data: NDFObject, filepath: string, options?: Partial<DumpOptions>): Promise<void> {
@@ -92,32 +374,46 @@ export class NoteDataFormat {
   // ============= MAIN PARSING =============
 
   parse(text: string, options?: Partial<ParseOptions>): NDFObject {
-    const result = this.parseWithMetadata(text, options);
-    
-    if (result.errors.length > 0) {
-      const opts = { ...this.defaultParseOptions, ...options };
-      if (opts.strict) {
-        throw new ValidationError(result.errors);
-      }
-    }
-
-    return result.data;
+    const ctx = this.createContext(options);
+    this.parseChunk(ctx, text);
+    return this.finishData(ctx);
   }
 
   parseWithMetadata(text: string, options?: Partial<ParseOptions>): ParseResult {
-    const opts: Required<ParseOptions> = { ...this.defaultParseOptions, ...options };
-    const lines = text.split('\n');
-    
-    const ctx: ParseContext = {
-      lines,
-      lineIndex: 0,
-      options: opts,
+    const ctx = this.createContext(options);
+    this.parseChunk(ctx, text);
+    return this.finishParse(ctx);
+  }
+
+  private createContext(options?: Partial<ParseOptions>): ParseContext {
+    const root: NDFObject = {};
+
+    return {
+      lineNumber: 0,
+      partialLine: '',
+      root,
+      stack: [{ kind: 'block', indent: 0, value: root, parent: null }],
+      textLines: [],
+      options: { ...this.defaultParseOptions, ...options },
       references: new Map(),
       errors: [],
       warnings: [],
     };
+  }
 
-    const data = this.parseBlock(ctx, 0);
+  private finishData(ctx: ParseContext): NDFObject {
+    const result = this.finishParse(ctx);
+
+    if (result.errors.length > 0 && ctx.options.strict) {
+      throw new ValidationError(result.errors);
+    }
+
+    return result.data;
+  }
+
+  private finishParse(ctx: ParseContext): ParseResult {
+    const opts = ctx.options;
+    const data = this.endLines(ctx);
 
     // Collect references
     ctx.references = collectReferences(data);
@@ -183,97 +479,180 @@ export class NoteDataFormat {
 
   dumps(data: NDFObject, options?: Partial<DumpOptions>): string {
     const opts: Required<DumpOptions> = { ...this.defaultDumpOptions, ...options };
-    return this.serializeObject(data, opts, opts.indentLevel);
+    const out: string[] = [];
+    const stack: DumpFrame[] = [this.objectFrame(data, opts, opts.indentLevel, -1)];
+
+    while (stack.length > 0) {
+      const frame = stack[stack.length - 1];
+
+      if (frame.kind === 'object') {
+        const entries = frame.entries;
+        if (frame.index === entries.length) {
+          stack.pop();
+          // An empty nested object still leaves a blank line after its header
+          if (out.length === frame.start) {
+            out.push('');
+          }
+          continue;
+        }
+
+        const [key, value] = entries[frame.index++];
+        const child = this.serializeEntry(key, value, opts, frame.level, out);
+        if (child) {
+          stack.push(child);
+        }
+        continue;
+      }
+
+      const items = frame.items;
+      if (frame.index === items.length) {
+        stack.pop();
+        continue;
+      }
+
+      const item = items[frame.index++];
+      const itemIndent = indentOf(opts.indent, frame.level + 1);
+      if (typeof item === 'object' && item !== null && !Array.isArray(item)) {
+        out.push(`${itemIndent}-`);
+        const child = this.serializeNested(item, opts, frame.level + 2, out);
+        if (child) {
+          stack.push(child);
+        }
+      } else {
+        out.push(`${itemIndent}- ${this.formatPrimitive(item)}`);
+      }
+    }
+
+    return out.join('\n');
   }
 
-  private serializeObject(obj: NDFObject, opts: Required<DumpOptions>, level: number): string {
-    const lines: string[] = [];
-    
+  private objectFrame(obj: NDFObject, opts: Required<DumpOptions>, level: number, start: number): DumpFrame {
+    return { kind: 'object', entries: this.objectEntries(obj, opts), index: 0, level, start };
+  }
+
+  private objectEntries(obj: NDFObject, opts: Required<DumpOptions>): Array<[string, NDFValue]> {
     let entries = Object.entries(obj);
     
     if (opts.sortKeys) {
       entries = entries.sort(([a], [b]) => a.localeCompare(b));
     }
 
-    for (const [key, value] of entries) {
-      if (!opts.includeReferences && isReferenceDefinition(key)) {
-        continue;
-      }
+    if (!opts.includeReferences) {
+      entries = entries.filter(([key]) => !isReferenceDefinition(key));
+    }
 
-      lines.push(this.serializeEntry(key, value, opts, level));
+    return entries;
+  }
+
+  /**
+   * Leaf objects are joined on their own and written as one string, which measured
+   * faster than pushing their short lines; other objects get a frame to continue with
+   */
+  private serializeNested(obj: NDFObject, opts: Required<DumpOptions>, level: number, out: string[]): DumpFrame | null {
+    if (!isLeafObject(obj)) {
+      return this.objectFrame(obj, opts, level, out.length);
     }
 
-    return lines.join('\n');
+    const lines: string[] = [];
+    for (const [key, value] of this.objectEntries(obj, opts)) {
+      this.serializeEntry(key, value, opts, level, lines);
+    }
+    // An empty object joins to '', the blank line after its header
+    out.push(lines.join('\n'));
+    return null;
   }
 
-  private serializeEntry(key: string, value: NDFValue, opts: Required<DumpOptions>, level: number): string {
-    const indent = opts.indent.repeat(level);
+  /** Write one entry; nested objects and block lists are returned as a frame to continue with */
+  private serializeEntry(key: string, value: NDFValue, opts: Required<DumpOptions>, level: number, out: string[]): DumpFrame | null {
+    const indent = indentOf(opts.indent, level);
 
     if (value === null) {
-      return `${indent}${key}: null`;
+      out.push(`${indent}${key}: null`);
+      return null;
     }
 
     if (typeof value === 'boolean') {
-      return `${indent}${key}: ${value ? 'yes' : 'no'}`;
+      out.push(`${indent}${key}: ${value ? 'yes' : 'no'}`);
+      return null;
     }
 
     if (typeof value === 'number') {
-      return `${indent}${key}: ${value}`;
+      out.push(`${indent}${key}: ${value}`);
+      return null;
     }
 
     if (typeof value === 'string') {
       if (value.includes('\n')) {
-        const contentLines = value.split('\n').map(line => `${indent}${opts.indent}${line}`);
-        return `${indent}${key}: |\n${contentLines.join('\n')}`;
+        const contentIndent = indentOf(opts.indent, level + 1);
+        out.push(`${indent}${key}: |`);
+        for (const line of value.split('\n')) {
+          out.push(`${contentIndent}${line}`);
+        }
+        return null;
       }
       const formatted = quoteIfNeeded(value);
-      return `${indent}${key}: ${formatted}`;
+      out.push(`${indent}${key}: ${formatted}`);
+      return null;
     }
 
     if (Array.isArray(value)) {
-      return this.serializeArray(key, value, opts, level);
+      return this.serializeArray(key, value, opts, level, out);
     }
 
     if (typeof value === 'object') {
-      const nested = this.serializeObject(value, opts, level + 1);
-      return `${indent}${key}:\n${nested}`;
+      out.push(`${indent}${key}:`);
+      return this.serializeNested(value, opts, level + 1, out);
     }
 
-    return `${indent}${key}: ${String(value)}`;
+    out.push(`${indent}${key}: ${String(value)}`);
+    return null;
   }
 
-  private serializeArray(key: string, arr: NDFArray, opts: Required<DumpOptions>, level: number): string {
-    const indent = opts.indent.repeat(level);
+  private serializeArray(key: string, arr: NDFArray, opts: Required<DumpOptions>, level: number, out: string[]): DumpFrame | null {
+    const indent = indentOf(opts.indent, level);
 
-    const allSimple = arr.every(item => 
-      item === null || 
-      typeof item === 'boolean' || 
-      typeof item === 'number' || 
-      (typeof item === 'string' && !item.includes('\n'))
-    );
+    // Every inline item takes at least one character plus its `, ` separator,
+    // so long arrays are known not to fit without formatting them
+    if (key.length + arr.length * 3 <= opts.inlineThreshold) {
+      let allSimple = true;
+      let allNumbers = true;
 
-    if (allSimple) {
-      const inlineItems = arr.map(item => this.formatPrimitive(item));
-      const inline = `${key}: ${inlineItems.join(', ')}`;
-      
-      if (inline.length <= opts.inlineThreshold) {
-        return `${indent}${inline}`;
+      for (const item of arr) {
+        if (typeof item === 'number') continue;
+        allNumbers = false;
+        if (!(item === null ||
+              typeof item === 'boolean' ||
+              (typeof item === 'string' && !item.includes('\n')))) {
+          allSimple = false;
+          break;
+        }
+      }
+
+      if (allSimple) {
+        const inlineItems = allNumbers
+          ? arr.join(', ')
+          : arr.map(item => this.formatPrimitive(item)).join(', ');
+        const inline = `${key}: ${inlineItems}`;
+        
+        if (inline.length <= opts.inlineThreshold) {
+          out.push(`${indent}${inline}`);
+          return null;
+        }
       }
     }
 
-    const lines = [`${indent}${key}:`];
-    
-    for (const item of arr) {
-      if (typeof item === 'object' && item !== null && !Array.isArray(item)) {
-        const nested = this.serializeObject(item, opts, level + 2);
-        lines.push(`${indent}${opts.indent}-`);
-        lines.push(nested);
-      } else {
-        lines.push(`${indent}${opts.indent}- ${this.formatPrimitive(item)}`);
+    if (!arr.some(item => typeof item === 'object' && item !== null && !Array.isArray(item))) {
+      const itemIndent = indentOf(opts.indent, level + 1);
+      const lines = [`${indent}${key}:`];
+      for (const item of arr) {
+        lines.push(`${itemIndent}- ${this.formatPrimitive(item)}`);
       }
+      out.push(lines.join('\n'));
+      return null;
     }
 
-    return lines.join('\n');
+    out.push(`${indent}${key}:`);
+    return { kind: 'list', items: arr, index: 0, level };
   }
 
   private formatPrimitive(value: NDFValue): string {
@@ -294,189 +673,194 @@ export class NoteDataFormat {
 
   // ============= INTERNAL PARSING =============
 
-  private parseBlock(ctx: ParseContext, startIndent: number): NDFObject {
-    const result: NDFObject = {};
+  private async parseStream(stream: ReadStream, options?: Partial<ParseOptions>): Promise<NDFObject> {
+    const ctx = this.createContext(options);
+    for await (const chunk of stream) {
+      this.parseChunk(ctx, chunk as string);
+    }
+    return this.finishData(ctx);
+  }
 
-    while (ctx.lineIndex < ctx.lines.length) {
-      const line = ctx.lines[ctx.lineIndex];
-      const lineNum = ctx.lineIndex + 1;
-      
-      if (!line.trim() || line.trim().startsWith('#')) {
-        ctx.lineIndex++;
-        continue;
-      }
+  private parseChunk(ctx: ParseContext, chunk: string): void {
+    const text = ctx.partialLine ? ctx.partialLine + chunk : chunk;
+    let start = 0;
+    let end = text.indexOf('\n');
 
-      const indent = this.getIndent(line);
+    while (end !== -1) {
+      this.parseLine(ctx, text.slice(start, end));
+      start = end + 1;
+      end = text.indexOf('\n', start);
+    }
 
-      if (indent < startIndent) {
-        break;
-      }
+    // The last line may continue in the next chunk
+    ctx.partialLine = text.slice(start);
+  }
 
-      if (indent > startIndent) {
-        ctx.lineIndex++;
-        continue;
-      }
+  private endLines(ctx: ParseContext): NDFObject {
+    this.parseLine(ctx, ctx.partialLine);
+    ctx.partialLine = '';
 
-      if (line.endsWith(' ') || line.endsWith('\t')) {
-        ctx.warnings.push({
-          message: 'Trailing whitespace',
-          line: lineNum,
-          column: line.length,
-          code: ErrorCodes.TRAILING_WHITESPACE,
-        });
-      }
+    const stack = ctx.stack;
+    while (stack.length > 1) {
+      this.closeFrame(ctx);
+    }
 
-      const cleanLine = this.removeInlineComment(line).trim();
-      
-      if (!cleanLine.includes(':')) {
-        ctx.lineIndex++;
-        continue;
-      }
+    return ctx.root;
+  }
 
-      const { key, value: valueStr, colonIndex } = this.splitKeyValue(cleanLine);
+  private parseLine(ctx: ParseContext, line: string): void {
+    const lineNum = ++ctx.lineNumber;
+    const stack = ctx.stack;
+    const indent = getIndent(line);
+    let frame = stack[stack.length - 1];
 
-      if (!key) {
-        ctx.errors.push({
-          message: 'Invalid key',
-          line: lineNum,
-          column: 1,
-          code: ErrorCodes.INVALID_KEY,
-        });
-        ctx.lineIndex++;
-        continue;
-      }
+    const blank = indent === line.length;
 
-      if (result.hasOwnProperty(key)) {
-        ctx.warnings.push({
-          message: `Duplicate key: ${key}`,
-          line: lineNum,
-          column: 1,
-          code: ErrorCodes.DUPLICATE_KEY,
-        });
+    if (frame.kind === 'text') {
+      const textLines = ctx.textLines;
+      if (blank) {
+        textLines.push('');
+        return;
       }
-
-      if (valueStr === '|') {
-        const { text, endIndex } = this.parseMultiline(ctx, ctx.lineIndex, indent);
-        result[key] = text;
-        ctx.lineIndex = endIndex;
-        continue;
+      if (indent >= frame.indent) {
+        textLines.push(line.slice(frame.indent));
+        frame.textLength = textLines.length;
+        return;
       }
+      this.closeFrame(ctx);
+      frame = stack[stack.length - 1];
+    }
 
-      if (!valueStr) {
-        const { data, endIndex } = this.parseNested(ctx, ctx.lineIndex, indent);
-        result[key] = data;
-        ctx.lineIndex = endIndex;
-        continue;
-      }
+    const lead = line[indent];
 
-      result[key] = this.parseValue(valueStr, ctx, lineNum, colonIndex + 2);
-      ctx.lineIndex++;
+    if (blank || lead === '#') {
+      return;
     }
 
-    return result;
-  }
+    // The first content line after `key:` decides what the key holds
+    if (frame.kind === 'pending') {
+      if (indent <= frame.indent) {
+        this.closeFrame(ctx);
+      } else {
+        const { parent, key } = frame;
+        const childIndent = frame.indent + 2;
+        stack[stack.length - 1] = lead === '-'
+          ? { kind: 'list', indent: childIndent, value: [], parent, key }
+          : { kind: 'block', indent: childIndent, value: {}, parent, key };
+      }
+    }
 
-  private parseMultiline(ctx: ParseContext, startLine: number, baseIndent: number): { text: string; endIndex: number } {
-    const textLines: string[] = [];
-    let i = startLine + 1;
-    const contentIndent = baseIndent + 2;
+    while (indent < stack[stack.length - 1].indent) {
+      this.closeFrame(ctx);
+    }
+    frame = stack[stack.length - 1];
 
-    while (i < ctx.lines.length) {
-      const line = ctx.lines[i];
-      if (!line.trim()) {
-        textLines.push('');
-        i++;
-        continue;
-      }
+    if (frame.kind === 'list') {
+      if (lead === '-') {
+        const items = frame.value;
+        const itemValue = line.slice(indent + 1).trim();
 
-      const lineIndent = this.getIndent(line);
-      if (lineIndent < contentIndent && line.trim()) {
-        break;
+        if (!itemValue) {
+          stack.push({ kind: 'pending', indent, parent: items });
+        } else {
+          items.push(this.parseValue(itemValue, ctx, lineNum, indent + 2));
+        }
       }
-
-      const content = line.length > contentIndent ? line.slice(contentIndent) : '';
-      textLines.push(content);
-      i++;
+      return;
     }
 
-    while (textLines.length > 0 && textLines[textLines.length - 1] === '') {
-      textLines.pop();
+    if (frame.kind !== 'block' || indent > frame.indent) {
+      return;
     }
 
-    return { text: textLines.join('\n'), endIndex: i };
-  }
+    const result = frame.value;
 
-  private parseNested(ctx: ParseContext, startLine: number, baseIndent: number): { data: NDFObject | NDFArray | null; endIndex: number } {
-    const nestedIndent = baseIndent + 2;
-    let i = startLine + 1;
+    if (line.endsWith(' ') || line.endsWith('\t')) {
+      ctx.warnings.push({
+        message: 'Trailing whitespace',
+        line: lineNum,
+        column: line.length,
+        code: ErrorCodes.TRAILING_WHITESPACE,
+      });
+    }
 
-    while (i < ctx.lines.length) {
-      const line = ctx.lines[i];
-      if (line.trim() && !line.trim().startsWith('#')) {
-        break;
-      }
-      i++;
+    // Split in place on the original line rather than on a trimmed copy
+    const content = removeInlineComment(line);
+    const colonIndex = content.indexOf(':', indent);
+    
+    if (colonIndex === -1) {
+      return;
     }
 
-    if (i >= ctx.lines.length) {
-      return { data: null, endIndex: i };
+    const key = content.slice(indent, colonIndex).trim();
+    const valueStr = content.slice(colonIndex + 1).trim();
+
+    if (!key) {
+      ctx.errors.push({
+        message: 'Invalid key',
+        line: lineNum,
+        column: 1,
+        code: ErrorCodes.INVALID_KEY,
+      });
+      return;
     }
 
-    const firstContentIndent = this.getIndent(ctx.lines[i]);
-    if (firstContentIndent <= baseIndent) {
-      return { data: null, endIndex: i };
+    if (result.hasOwnProperty(key)) {
+      ctx.warnings.push({
+        message: `Duplicate key: ${key}`,
+        line: lineNum,
+        column: 1,
+        code: ErrorCodes.DUPLICATE_KEY,
+      });
     }
 
-    if (ctx.lines[i].trim().startsWith('-')) {
-      return this.parseList(ctx, i, baseIndent);
+    if (valueStr === '|') {
+      stack.push({
+        kind: 'text',
+        indent: indent + 2,
+        textLength: 0,
+        parent: result,
+        key,
+      });
+      return;
     }
 
-    const savedIndex = ctx.lineIndex;
-    ctx.lineIndex = i;
-    const data = this.parseBlock(ctx, nestedIndent);
-    const endIndex = ctx.lineIndex;
-    ctx.lineIndex = savedIndex;
+    if (!valueStr) {
+      stack.push({ kind: 'pending', indent, parent: result, key });
+      return;
+    }
 
-    return { data: Object.keys(data).length > 0 ? data : null, endIndex };
+    result[key] = this.parseValue(valueStr, ctx, lineNum, colonIndex - indent + 2);
   }
 
-  private parseList(ctx: ParseContext, startLine: number, baseIndent: number): { data: NDFArray; endIndex: number } {
-    const result: NDFArray = [];
-    const listIndent = baseIndent + 2;
-    let i = startLine;
-
-    while (i < ctx.lines.length) {
-      const line = ctx.lines[i];
-      if (!line.trim() || line.trim().startsWith('#')) {
-        i++;
-        continue;
-      }
+  // Pop the innermost frame and store its value in the parent
+  private closeFrame(ctx: ParseContext): void {
+    const frame = ctx.stack.pop();
+    if (!frame) {
+      return;
+    }
 
-      const lineIndent = this.getIndent(line);
-      if (lineIndent < listIndent) {
-        break;
-      }
+    let value: NDFValue = null;
 
-      const trimmed = line.trim();
-      if (trimmed.startsWith('-')) {
-        const itemValue = trimmed.slice(1).trim();
+    if (frame.kind === 'block') {
+      value = hasOwnKeys(frame.value) ? frame.value : null;
+    } else if (frame.kind === 'list') {
+      value = frame.value;
+    } else if (frame.kind === 'text') {
+      // Trailing blank lines are not part of the text
+      const textLines = ctx.textLines;
+      textLines.length = frame.textLength;
+      value = textLines.join('\n');
+      textLines.length = 0;
+    }
 
-        if (!itemValue) {
-          const { data, endIndex } = this.parseNested(ctx, i, lineIndent);
-          if (data !== null) {
-            result.push(data);
-          }
-          i = endIndex;
-        } else {
-          result.push(this.parseValue(itemValue, ctx, i + 1, lineIndent + 2));
-          i++;
-        }
-      } else {
-        i++;
+    if (Array.isArray(frame.parent)) {
+      if (value !== null) {
+        frame.parent.push(value);
       }
+    } else if (frame.parent && frame.key !== undefined) {
+      frame.parent[frame.key] = value;
     }
-
-    return { data: result, endIndex: i };
   }
 
   private parseValue(value: string, ctx: ParseContext, line: number, column: number): NDFValue {
@@ -484,13 +868,20 @@ export class NoteDataFormat {
     if (!value) {
       return null;
     }
-    if (value.startsWith('{') && value.endsWith('}')) {
+    const first = value[0];
+    const last = value[value.length - 1];
+    // Quoted strings are never lists, references or inline structures,
+    // even when they contain commas or spaces
+    if (first === '"' || first === "'") {
+      return parseSimpleValue(value);
+    }
+    if (first === '{' && last === '}') {
       return this.parseInlineObject(value, ctx, line, column);
     }
-    if (value.startsWith('[') && value.endsWith(']')) {
+    if (first === '[' && last === ']') {
       return this.parseArray(value, ctx, line, column);
     }
-    if (isReference(value)) {
+    if (first === '$' && isReference(value)) {
       if (ctx.options.preserveReferences) {
         return value;
       }
@@ -508,40 +899,18 @@ export class NoteDataFormat {
         }
       }
     }
-    if (!value.startsWith('"') && !value.startsWith("'")) {
-      if (value.includes(',')) {
-        return value.split(',').map(s => this.parseSimpleValue(s.trim()));
-      }
-      const parts = value.split(/\s+/).filter(s => s);
-      if (parts.length > 1 && parts.every(p => !p.includes('.') && p.length < 20)) {
-        return parts.map(s => this.parseSimpleValue(s));
-      }
+    if (value.includes(',')) {
+      return value.split(',').map(s => parseSimpleValue(s.trim()));
     }
-    return this.parseSimpleValue(value);
-  }
-
-  private parseSimpleValue(value: string): NDFPrimitive {
-    value = value.trim();
-    if ((value.startsWith('"') && value.endsWith('"')) ||
-        (value.startsWith("'") && value.endsWith("'"))) {
-      const inner = value.slice(1, -1);
-      return processEscapes(inner);
-    }
-    const lower = value.toLowerCase();
-    if (lower === 'yes' || lower === 'true') return true;
-    if (lower === 'no' || lower === 'false') return false;
-    if (lower === 'null' || lower === 'none' || lower === '-') return null;
-    if (/^-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?$/.test(value)) {
-      return Number(value);
-    }
-    if (value.startsWith('@')) {
-      const match = value.match(/^@\w+(?:\[\d+\])?\s+(.+)$/);
-      if (match) {
-        return this.parseSimpleValue(match[1]);
+    // Space-separated lists never contain '.', and most scalars have no inner
+    // whitespace, so only real candidates are split
+    if (!value.includes('.') && WHITESPACE_PATTERN.test(value)) {
+      const parts = value.split(WHITESPACE_SPLIT_PATTERN);
+      if (parts.every(p => p.length < 20)) {
+        return parts.map(s => parseSimpleValue(s));
       }
-      return value;
     }
-    return value;
+    return parseSimpleValue(value);
   }
 
   private parseInlineObject(text: string, ctx: ParseContext, line: number, column: number): NDFObject {
@@ -550,23 +919,7 @@ export class NoteDataFormat {
 
     if (!inner) return result;
 
-    let depth = 0;
-    let current = '';
-    const pairs: string[] = [];
-
-    for (const char of inner) {
-      if (char === '{') depth++;
-      else if (char === '}') depth--;
-      else if (char === ',' && depth === 0) {
-        pairs.push(current.trim());
-        current = '';
-        continue;
-      }
-      current += char;
-    }
-    if (current.trim()) pairs.push(current.trim());
-
-    for (const pair of pairs) {
+    for (const pair of splitTopLevel(inner)) {
       const colonIdx = pair.indexOf(':');
       if (colonIdx === -1) continue;
 
@@ -582,80 +935,30 @@ export class NoteDataFormat {
   }
 
   private parseArray(text: string, ctx: ParseContext, line: number, column: number): NDFArray {
+    if (NUMERIC_ARRAY_PATTERN.test(text)) {
+      try {
+        return JSON.parse(text) as NDFArray;
+      } catch {
+        // Not valid JSON (e.g. `[1,,2]` or `[.5]`); use the general scanner
+      }
+    }
+
     const inner = text.slice(1, -1).trim();
 
     if (!inner) return [];
 
-    let depth = 0;
-    let braceDepth = 0;
-    let current = '';
-    const items: string[] = [];
-
-    for (const char of inner) {
-      if (char === '[') depth++;
-      else if (char === ']') depth--;
-      else if (char === '{') braceDepth++;
-      else if (char === '}') braceDepth--;
-      else if (char === ',' && depth === 0 && braceDepth === 0) {
-        items.push(current.trim());
-        current = '';
-        continue;
-      }
-      current += char;
-    }
-    if (current.trim()) items.push(current.trim());
-
-    return items.map(item => {
-      if (item.startsWith('[')) {
+    return splitTopLevel(inner).map(item => {
+      const first = item[0];
+      if (first === '[') {
         return this.parseArray(item, ctx, line, column);
       }
-      if (item.startsWith('{')) {
+      if (first === '{') {
         return this.parseInlineObject(item, ctx, line, column);
       }
-      return this.parseSimpleValue(item);
+      return parseSimpleValue(item);
     });
   }
 
-  // ============= HELPERS =============
-
-  private getIndent(line: string): number {
-    const match = line.match(/^(\s*)/);
-    return match ? match[1].length : 0;
-  }
-
-  private removeInlineComment(line: string): string {
-    let inString = false;
-    let stringChar = '';
-    
-    for (let i = 0; i < line.length; i++) {
-      const char = line[i];
-      const prevChar = i > 0 ? line[i - 1] : '';
-      
-      if (!inString && (char === '"' || char === "'")) {
-        inString = true;
-        stringChar = char;
-      } else if (inString && char === stringChar && prevChar !== '\\') {
-        inString = false;
-      } else if (!inString && char === '#') {
-        return line.slice(0, i);
-      }
-    }
-    
-    return line;
-  }
-
-  private splitKeyValue(line: string): { key: string; value: string; colonIndex: number } {
-    const colonIndex = line.indexOf(':');
-    if (colonIndex === -1) {
-      return { key: line.trim(), value: '', colonIndex: line.length };
-    }
-    return {
-      key: line.slice(0, colonIndex).trim(),
-      value: line.slice(colonIndex + 1).trim(),
-      colonIndex,
-    };
-  }
-
   // ============= UTILITY METHODS =============
 
   /** Get a value by path */
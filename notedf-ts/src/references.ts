@@ -1,13 +1,16 @@
 import { NDFValue, NDFObject, ReferenceStore, ParseOptions } from './types';
 import { ReferenceError, ErrorCodes } from './errors';
 
+const REFERENCE_USAGE_PATTERN = /^\$([a-zA-Z_][a-zA-Z0-9_]*)(?:\s*\{([^}]*)\})?$/;
+const REFERENCE_NAME_PATTERN = /^\$([a-zA-Z_][a-zA-Z0-9_]*)$/;
+
 export interface ReferenceUsage {
   name: string;
   overrides?: NDFObject;
 }
 
 export function parseReference(text: string): ReferenceUsage | null {
-  const match = text.match(/^\$([a-zA-Z_][a-zA-Z0-9_]*)(?:\s*\{([^}]*)\})?$/);
+  const match = text.match(REFERENCE_USAGE_PATTERN);
   
   if (!match) {
     return null;
@@ -39,15 +42,15 @@ export function parseReference(text: string): ReferenceUsage | null {
 }
 
 export function isReference(text: string): boolean {
-  return /^\$[a-zA-Z_][a-zA-Z0-9_]*(?:\s*\{[^}]*\})?$/.test(text.trim());
+  return REFERENCE_USAGE_PATTERN.test(text.trim());
 }
 
 export function isReferenceDefinition(key: string): boolean {
-  return /^\$[a-zA-Z_][a-zA-Z0-9_]*$/.test(key);
+  return REFERENCE_NAME_PATTERN.test(key);
 }
 
 export function getReferenceNameFromKey(key: string): string | null {
-  const match = key.match(/^\$([a-zA-Z_][a-zA-Z0-9_]*)$/);
+  const match = key.match(REFERENCE_NAME_PATTERN);
   return match ? match[1] : null;
 }
 